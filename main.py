@@ -1,75 +1,24 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from src.data_processing.excel_reader import ler_arquivo_excel
+from src.data_processing.excel_reader import conteudo_arquivo, ler_arquivo_excel_cached
 from src.data_processing.s_curve import processar_dados, selecionar_feriados
 from src.data_processing.indicators import calcular_indicadores, analisar_duracao, analisar_folga_curta
 from src.visualizations.gantt import caminho_critico_com_gantt
 from src.utils.utils import format_currency
+from src.ui_components.styles import carregar_css
 
 # Configuração global
+# Copy-on-Write: seleções e filtros compartilham memória com o DataFrame original até serem modificados
+pd.options.mode.copy_on_write = True
 st.set_page_config(page_title="Validação DCMA", page_icon="📊", layout="wide")
-st.markdown(
-    """
-    <style>
-    .stApp {
-        background-color: #F5F7FA;
-        padding: 20px;
-        font-family: 'Roboto', sans-serif;
-    }
-    h1, h2, h3 {
-        color: #0068C9;
-    }
-    .dataframe th, .dataframe td {
-        font-size: 14px;
-        text-align: center;
-        padding: 12px;
-        border: 1px solid #E0E0E0;
-        background-color: #FFFFFF;
-    }
-    .dataframe th {
-        background-color: #0068C9;
-        color: white;
-    }
-    .stButton > button {
-        background-color: #0068C9;
-        color: white;
-        border-radius: 8px;
-        padding: 10px 20px;
-        font-weight: bold;
-    }
-    .stButton > button:hover {
-        background-color: #004A8F;
-    }
-    .card {
-        background-color: #FFFFFF;
-        border-radius: 12px;
-        box-shadow: 0 2px 10px rgba(0, 0, 0, 0.06);
-        padding: 20px;
-        margin-bottom: 20px;
-    }
-    .card h4 {
-        font-size: 16px;
-        margin-bottom: 5px;
-        color: #333;
-    }
-    .card p {
-        font-size: 24px;
-        margin: 0;
-        color: #0068C9;
-        font-weight: bold;
-    }
-    .card small {
-        color: #555;
-        font-weight: normal;
-    }
-    .scrollable-table {
-        max-height: 350px;
-        overflow-y: auto;
-    }
-    </style>
-    """, unsafe_allow_html=True
-)
+st.markdown(f"<style>{carregar_css()}</style>", unsafe_allow_html=True)
+
+# Datas permanecem datetime64 nas tabelas; o navegador aplica o formato DD/MM/YYYY
+COLUNAS_DATA = {
+    'Início BL': st.column_config.DateColumn(format='DD/MM/YYYY'),
+    'Término BL': st.column_config.DateColumn(format='DD/MM/YYYY'),
+}
 
 # Sidebar
 st.sidebar.markdown(
@@ -87,38 +36,181 @@ feriados_texto = st.sidebar.text_area(
     placeholder="Ex.: 01/01/2025\n15/11/2025",
     help="Insira uma data por linha no formato DD/MM/YYYY."
 )
-agrupamento_opcao = st.sidebar.selectbox(
-    "📅 Agrupamento da Curva S",
-    options=["Mês", "Semana"],
-    help="Selecione o período de agrupamento para a Curva S."
-)
-st.sidebar.markdown("### Fatores da Curva S")
-s30 = st.sidebar.number_input("Fator S30", min_value=0.0, max_value=10.0, value=2.5, step=0.1)
-s50 = st.sidebar.number_input("Fator S50", min_value=0.0, max_value=10.0, value=2.5, step=0.1)
-s70 = st.sidebar.number_input("Fator S70", min_value=0.0, max_value=10.0, value=2.5, step=0.1)
-st.sidebar.markdown("### Limites de Duração (em dias)")
-limite_alta = st.sidebar.number_input(
-    "Alta Duração (dias)",
-    min_value=0.0,
-    value=30.0,
-    step=1.0,
-    help="Número de dias para considerar tarefas de alta duração."
-)
-limite_baixa = st.sidebar.number_input(
-    "Baixa Duração (dias)",
-    min_value=0.0,
-    value=5.0,
-    step=1.0,
-    help="Número de dias para considerar tarefas de baixa duração."
-)
-st.sidebar.markdown("### Limite de Folga (em dias)")
-limite_folga = st.sidebar.number_input(
-    "Folga Curta (dias)",
-    min_value=0.0,
-    value=5.0,
-    step=1.0,
-    help="Número de dias para considerar tarefas com folga curta."
-)
+
+
+def exibir_tabela_tarefas(titulo, tabela, mensagem_vazia, key):
+    """
+    Exibe uma tabela de tarefas com título, ou um aviso quando a tabela está vazia.
+
+    Args:
+        titulo (str): Título exibido acima da tabela.
+        tabela (pd.DataFrame): Tarefas a exibir, com colunas 'Início BL' e 'Término BL'.
+        mensagem_vazia (str): Aviso exibido quando não há tarefas.
+        key (str): Chave única do elemento, estável entre reexecuções.
+    """
+    st.markdown(f"### {titulo}")
+    if tabela.empty:
+        st.warning(mensagem_vazia)
+        return
+    st.dataframe(tabela, use_container_width=True, key=key, column_config=COLUNAS_DATA)
+
+
+# Seções da análise. Cada seção é um fragmento: alterar um controle da seção reexecuta apenas ela.
+@st.fragment
+def secao_curva_s(arquivo_excel, feriados_texto, conteudo):
+    """
+    Exibe a Curva S com os controles de agrupamento e fatores S30, S50 e S70.
+
+    Args:
+        arquivo_excel: Arquivo Excel carregado via Streamlit file_uploader.
+        feriados_texto (str): Texto com feriados, uma data por linha.
+        conteudo (tuple): (bytes, hash) do arquivo, obtidos uma única vez por conteudo_arquivo.
+    """
+    st.subheader("Curva S")
+    cols_curva = st.columns(4)
+    agrupamento_opcao = cols_curva[0].selectbox(
+        "📅 Agrupamento da Curva S",
+        options=["Mês", "Semana"],
+        help="Selecione o período de agrupamento para a Curva S."
+    )
+    s30 = cols_curva[1].number_input("Fator S30", min_value=0.0, max_value=10.0, value=2.5, step=0.1)
+    s50 = cols_curva[2].number_input("Fator S50", min_value=0.0, max_value=10.0, value=2.5, step=0.1)
+    s70 = cols_curva[3].number_input("Fator S70", min_value=0.0, max_value=10.0, value=2.5, step=0.1)
+    with st.spinner("Gerando Curva S..."):
+        feriados = selecionar_feriados(feriados_texto)
+        curva_s = processar_dados(arquivo_excel, feriados_texto, agrupamento_opcao, s30, s50, s70,
+                                  feriados_arr=feriados, conteudo=conteudo)
+        if curva_s is not None:
+            # Gráfico da Curva S
+            colunas_pct = ['% Acum.', '%C30', '%C50', '%C70']
+            cores = ['#0068C9', '#FF9900', '#FF2D55', '#00A86B']
+            x = curva_s.index.to_numpy()
+            traces = [
+                go.Scattergl(
+                    x=x,
+                    y=curva_s[col].to_numpy(),
+                    mode='lines+markers',
+                    name=col,
+                    line=dict(color=cor)
+                )
+                for col, cor in zip(colunas_pct, cores)
+            ]
+            fig = go.Figure(
+                data=traces,
+                layout=go.Layout(
+                    title="Curva S - Progresso Acumulado",
+                    xaxis_title="Período",
+                    yaxis_title="Percentual (%)",
+                    template="plotly_white",
+                    height=600,
+                    font=dict(size=14),
+                    margin=dict(l=50, r=50, t=80, b=50)
+                )
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Tabela da Curva S
+            st.markdown("### Dados da Curva S")
+            st.dataframe(
+                curva_s[['Custo Total', '% ', '% Acum.', '%C30', '%C50', '%C70']],
+                use_container_width=True,
+                column_config={
+                    col: st.column_config.NumberColumn(format='%.1f%%')
+                    for col in ['% ', '% Acum.', '%C30', '%C50', '%C70']
+                }
+            )
+        else:
+            st.error("Não foi possível gerar a Curva S. Verifique o arquivo Excel e os feriados.")
+
+
+@st.fragment
+def secao_tarefas_criticas(df):
+    """
+    Exibe a tabela de tarefas críticas e o gráfico de Gantt.
+
+    Args:
+        df (pd.DataFrame): DataFrame com dados do cronograma.
+    """
+    st.subheader("Tarefas Críticas e Gráfico de Gantt")
+    with st.spinner("Gerando análise de tarefas críticas..."):
+        tabela_critica, fig_gantt = caminho_critico_com_gantt(df)
+        if not tabela_critica.empty:
+            # Tabela de Tarefas Críticas
+            st.markdown("### Tarefas Críticas")
+            st.dataframe(tabela_critica, use_container_width=True, column_config=COLUNAS_DATA)
+
+            # Gráfico de Gantt
+            st.markdown("### Gráfico de Gantt")
+            st.plotly_chart(fig_gantt, use_container_width=True)
+        else:
+            st.warning("Nenhuma tarefa crítica encontrada no cronograma.")
+
+
+@st.fragment
+def secao_duracao(df):
+    """
+    Exibe as tarefas de alta e baixa duração com os controles de limite em dias.
+
+    Args:
+        df (pd.DataFrame): DataFrame com dados do cronograma.
+    """
+    st.subheader("Análise de Alta e Baixa Duração")
+    cols_duracao = st.columns(2)
+    limite_alta = cols_duracao[0].number_input(
+        "Alta Duração (dias)",
+        min_value=0.0,
+        value=30.0,
+        step=1.0,
+        help="Número de dias para considerar tarefas de alta duração."
+    )
+    limite_baixa = cols_duracao[1].number_input(
+        "Baixa Duração (dias)",
+        min_value=0.0,
+        value=5.0,
+        step=1.0,
+        help="Número de dias para considerar tarefas de baixa duração."
+    )
+    with st.spinner("Analisando durações das tarefas..."):
+        tarefas_alta, tarefas_baixa = analisar_duracao(df, limite_alta, limite_baixa)
+        exibir_tabela_tarefas(
+            f"Tarefas com Alta Duração (>= {limite_alta} dias)",
+            tarefas_alta,
+            f"Nenhuma tarefa com duração >= {limite_alta} dias encontrada.",
+            key="tabela_alta_duracao"
+        )
+        exibir_tabela_tarefas(
+            f"Tarefas com Baixa Duração (<= {limite_baixa} dias)",
+            tarefas_baixa,
+            f"Nenhuma tarefa com duração <= {limite_baixa} dias encontrada.",
+            key="tabela_baixa_duracao"
+        )
+
+
+@st.fragment
+def secao_folga_curta(df):
+    """
+    Exibe as tarefas com folga curta com o controle de limite em dias.
+
+    Args:
+        df (pd.DataFrame): DataFrame com dados do cronograma.
+    """
+    st.subheader("Análise de Folga Curta")
+    limite_folga = st.number_input(
+        "Folga Curta (dias)",
+        min_value=0.0,
+        value=5.0,
+        step=1.0,
+        help="Número de dias para considerar tarefas com folga curta."
+    )
+    with st.spinner("Analisando tarefas com folga curta..."):
+        tarefas_folga_curta = analisar_folga_curta(df, limite_folga)
+        exibir_tabela_tarefas(
+            f"Tarefas com Folga Curta (<= {limite_folga} dias)",
+            tarefas_folga_curta,
+            f"Nenhuma tarefa com folga <= {limite_folga} dias encontrada.",
+            key="tabela_folga_curta"
+        )
+
 
 # Interface principal
 st.markdown("<h1 style='text-align: center;'>Validação Cronograma DCMA</h1>", unsafe_allow_html=True)
@@ -126,7 +218,9 @@ st.divider()
 
 if arquivo_excel is not None:
     with st.spinner("Processando arquivo Excel..."):
-        df = ler_arquivo_excel(arquivo_excel)
+        # Conteúdo e hash do arquivo calculados uma vez e compartilhados pelos caches da leitura e da Curva S
+        conteudo = conteudo_arquivo(arquivo_excel)
+        df = ler_arquivo_excel_cached(*conteudo)
         if df is not None:
             # Resumo do Projeto
             st.subheader("Resumo do Projeto")
@@ -216,176 +310,11 @@ if arquivo_excel is not None:
                     """, unsafe_allow_html=True
                 )
 
-            # Seção da Curva S
-            with st.container():
-                st.subheader("Curva S")
-                with st.spinner("Gerando Curva S..."):
-                    curva_s = processar_dados(arquivo_excel, feriados_texto, agrupamento_opcao, s30, s50, s70)
-                    if curva_s is not None:
-                        # Gráfico da Curva S
-                        fig = go.Figure()
-                        fig.add_trace(go.Scatter(
-                            x=curva_s.index,
-                            y=curva_s['% Acum.'].str.rstrip('%').astype(float),
-                            mode='lines+markers',
-                            name='% Acum.',
-                            line=dict(color='#0068C9')
-                        ))
-                        fig.add_trace(go.Scatter(
-                            x=curva_s.index,
-                            y=curva_s['%C30'].str.rstrip('%').astype(float),
-                            mode='lines+markers',
-                            name='%C30',
-                            line=dict(color='#FF9900')
-                        ))
-                        fig.add_trace(go.Scatter(
-                            x=curva_s.index,
-                            y=curva_s['%C50'].str.rstrip('%').astype(float),
-                            mode='lines+markers',
-                            name='%C50',
-                            line=dict(color='#FF2D55')
-                        ))
-                        fig.add_trace(go.Scatter(
-                            x=curva_s.index,
-                            y=curva_s['%C70'].str.rstrip('%').astype(float),
-                            mode='lines+markers',
-                            name='%C70',
-                            line=dict(color='#00A86B')
-                        ))
-                        fig.update_layout(
-                            title="Curva S - Progresso Acumulado",
-                            xaxis_title="Período",
-                            yaxis_title="Percentual (%)",
-                            template="plotly_white",
-                            height=600,
-                            font=dict(size=14),
-                            margin=dict(l=50, r=50, t=80, b=50)
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
-
-                        # Tabela da Curva S
-                        st.markdown("### Dados da Curva S")
-                        st.markdown(
-                            """
-                            <div class="scrollable-table">
-                                <style>
-                                .scrollable-table table {
-                                    width: 100%;
-                                    border-collapse: collapse;
-                                }
-                                </style>
-                            """, unsafe_allow_html=True
-                        )
-                        st.dataframe(curva_s[['Custo Total', '% ', '% Acum.', '%C30', '%C50', '%C70']],
-                                     use_container_width=True)
-                    else:
-                        st.error("Não foi possível gerar a Curva S. Verifique o arquivo Excel e os feriados.")
-
-            # Seção de Tarefas Críticas e Gantt
-            with st.container():
-                st.subheader("Tarefas Críticas e Gráfico de Gantt")
-                with st.spinner("Gerando análise de tarefas críticas..."):
-                    tabela_critica, fig_gantt = caminho_critico_com_gantt(df)
-                    if not tabela_critica.empty:
-                        # Tabela de Tarefas Críticas
-                        st.markdown("### Tarefas Críticas")
-                        st.markdown(
-                            """
-                            <div class="scrollable-table">
-                                <style>
-                                .scrollable-table table {
-                                    width: 100%;
-                                    border-collapse: collapse;
-                                }
-                                </style>
-                            """, unsafe_allow_html=True
-                        )
-                        tabela_critica['Início BL'] = pd.to_datetime(tabela_critica['Início BL']).dt.strftime(
-                            '%d/%m/%Y')
-                        tabela_critica['Término BL'] = pd.to_datetime(tabela_critica['Término BL']).dt.strftime(
-                            '%d/%m/%Y')
-                        st.dataframe(tabela_critica, use_container_width=True)
-
-                        # Gráfico de Gantt
-                        st.markdown("### Gráfico de Gantt")
-                        st.plotly_chart(fig_gantt, use_container_width=True)
-                    else:
-                        st.warning("Nenhuma tarefa crítica encontrada no cronograma.")
-
-            # Seção de Análise de Alta e Baixa Duração
-            with st.container():
-                st.subheader("Análise de Alta e Baixa Duração")
-                with st.spinner("Analisando durações das tarefas..."):
-                    tarefas_alta, tarefas_baixa = analisar_duracao(df, limite_alta, limite_baixa)
-                    for tabela in [tarefas_alta, tarefas_baixa]:
-                        if not tabela.empty:
-                            tabela['Início BL'] = pd.to_datetime(tabela['Início BL']).dt.strftime('%d/%m/%Y')
-                            tabela['Término BL'] = pd.to_datetime(tabela['Término BL']).dt.strftime('%d/%m/%Y')
-
-                    # Tabela de Tarefas de Alta Duração
-                    st.markdown(f"### Tarefas com Alta Duração (>= {limite_alta} dias)")
-                    if not tarefas_alta.empty:
-                        st.markdown(
-                            """
-                            <div class="scrollable-table">
-                                <style>
-                                .scrollable-table table {
-                                    width: 100%;
-                                    border-collapse: collapse;
-                                }
-                                </style>
-                            """, unsafe_allow_html=True
-                        )
-                        st.dataframe(tarefas_alta, use_container_width=True)
-                    else:
-                        st.warning(f"Nenhuma tarefa com duração >= {limite_alta} dias encontrada.")
-
-                    # Tabela de Tarefas de Baixa Duração
-                    st.markdown(f"### Tarefas com Baixa Duração (<= {limite_baixa} dias)")
-                    if not tarefas_baixa.empty:
-                        st.markdown(
-                            """
-                            <div class="scrollable-table">
-                                <style>
-                                .scrollable-table table {
-                                    width: 100%;
-                                    border-collapse: collapse;
-                                }
-                                </style>
-                            """, unsafe_allow_html=True
-                        )
-                        st.dataframe(tarefas_baixa, use_container_width=True)
-                    else:
-                        st.warning(f"Nenhuma tarefa com duração <= {limite_baixa} dias encontrada.")
-
-            # Seção de Análise de Folga Curta
-            with st.container():
-                st.subheader("Análise de Folga Curta")
-                with st.spinner("Analisando tarefas com folga curta..."):
-                    tarefas_folga_curta = analisar_folga_curta(df, limite_folga)
-                    for tabela in [tarefas_folga_curta]:
-                        if not tabela.empty:
-                            tabela['Início BL'] = pd.to_datetime(tabela['Início BL']).dt.strftime('%d/%m/%Y')
-                            tabela['Término BL'] = pd.to_datetime(tabela['Término BL']).dt.strftime('%d/%m/%Y')
-
-                    # Tabela de Tarefas com Folga Curta
-                    st.markdown(f"### Tarefas com Folga Curta (<= {limite_folga} dias)")
-                    if not tarefas_folga_curta.empty:
-                        st.markdown(
-                            """
-                            <div class="scrollable-table">
-                                <style>
-                                .scrollable-table table {
-                                    width: 100%;
-                                    border-collapse: collapse;
-                                }
-                                </style>
-                            """, unsafe_allow_html=True
-                        )
-                        st.dataframe(tarefas_folga_curta, use_container_width=True)
-                    else:
-                        st.warning(f"Nenhuma tarefa com folga <= {limite_folga} dias encontrada.")
-
+            # Seções da análise
+            secao_curva_s(arquivo_excel, feriados_texto, conteudo)
+            secao_tarefas_criticas(df)
+            secao_duracao(df)
+            secao_folga_curta(df)
 
 else:
     st.info("Por favor, carregue um arquivo Excel para começar a análise.")
@@ -1,23 +1,67 @@
+import hashlib
+from io import BytesIO
+
 import streamlit as st
 import pandas as pd
+import numpy as np
 
+# Sufixos de unidade ('dia', 'dias', 'diasd') removidos das colunas de texto. Mantido como texto (e não
+# re.compile): nas colunas string[pyarrow] só um padrão em str roda no kernel de regex do Arrow
+_DIAS_PADRAO = r'dias?d?'
 
-@st.cache_data
-def ler_arquivo_excel(arquivo_excel):
+# Colunas da planilha utilizadas pela aplicação; as demais não são carregadas
+COLUNAS_UTILIZADAS = frozenset({
+    "Início Agendado",
+    "Término Agendado",
+    "Início da Linha de Base",
+    "Término da linha de base",
+    "Duração da Linha de Base",
+    "Margem de atraso permitida",
+    "Predecessoras",
+    "Sucessoras",
+    "Resumo",
+    "Custo",
+    "Nome da tarefa",
+    "Crítica",
+    "Duração",
+    "Quant. Prev.",
+    "Produtividade",
+})
+
+
+def conteudo_arquivo(arquivo_excel):
     """
-    Lê e processa um arquivo Excel com dados de cronograma.
+    Obtém o conteúdo de um arquivo carregado e o hash usado como chave dos caches que dependem dele.
 
     Args:
         arquivo_excel: Arquivo Excel carregado via Streamlit file_uploader.
 
+    Returns:
+        tuple: (bytes do arquivo, hash BLAKE2b do conteúdo em hexadecimal).
+    """
+    file_bytes = arquivo_excel.getvalue()
+    return file_bytes, hashlib.blake2b(file_bytes).hexdigest()
+
+
+@st.cache_data
+def ler_arquivo_excel_cached(_file_bytes, file_hash):
+    """
+    Lê e processa o conteúdo de um arquivo Excel com dados de cronograma.
+
+    Args:
+        _file_bytes (bytes): Conteúdo do arquivo Excel (ignorado pelo hash do cache).
+        file_hash (str): Hash BLAKE2b do conteúdo, usado como chave do cache.
+
     Returns:
         pandas.DataFrame: DataFrame processado ou None em caso de erro.
     """
     try:
         # Ler o arquivo Excel
         df = pd.read_excel(
-            arquivo_excel,
-            sheet_name="Planilha1"
+            BytesIO(_file_bytes),
+            sheet_name="Planilha1",
+            engine="calamine",
+            usecols=lambda col: col in COLUNAS_UTILIZADAS
         )
 
         # Renomear colunas esperadas
@@ -45,54 +89,115 @@ def ler_arquivo_excel(arquivo_excel):
             "Produtividade": 0,
             "Folga": 0
         }
-        for col, default in optional_columns.items():
-            if col not in df.columns:
-                df[col] = default
+        colunas_ausentes = {col: default for col, default in optional_columns.items() if col not in df.columns}
+        if colunas_ausentes:
+            df = df.assign(**colunas_ausentes)
+
+        # Converter colunas de texto para strings PyArrow: as operações .str passam a usar o Arrow
+        colunas_texto = df.select_dtypes(include='object').columns
+        df[colunas_texto] = df[colunas_texto].astype('string[pyarrow]')
 
         # Verificar e processar a coluna Resumo (opcional)
         if 'Resumo' in df.columns:
-            df = df.query("Resumo == 'Não'").copy()
+            df['Resumo'] = df['Resumo'].astype('category')
+            try:
+                codigo_nao = df['Resumo'].cat.categories.get_loc('Não')
+            except KeyError:
+                # Nenhuma linha marcada como 'Não': todas são resumos
+                df = df.iloc[0:0]
+            else:
+                df = df.loc[df['Resumo'].cat.codes.to_numpy() == codigo_nao]
         else:
             st.warning("Coluna 'Resumo' não encontrada. Todas as linhas serão processadas.")
 
         # Converter colunas de data para datetime
         date_columns = ["Início Agendado", "Término Agendado", "Início BL", "Término BL"]
-        for col in date_columns:
-            if col in df.columns:
-                try:
-                    df[col] = pd.to_datetime(df[col], format='%d.%m.%y', errors='coerce')
-                    if df[col].isna().any():
-                        st.warning(
-                            f"Algumas datas na coluna '{col}' não puderam ser convertidas. Verifique o formato (DD.MM.YY).")
-                except Exception as e:
-                    st.error(f"Erro ao converter a coluna '{col}' para data: {str(e)}")
-                    return None
+        colunas_data = [col for col in date_columns if col in df.columns]
+        try:
+            datas = df[colunas_data].apply(
+                lambda col: pd.to_datetime(col, format='%d.%m.%y', errors='coerce', cache=True))
+        except Exception as e:
+            st.error(f"Erro ao converter as colunas de data: {str(e)}")
+            return None
+        df[colunas_data] = datas
+        colunas_invalidas = datas.columns[datas.isna().any()].tolist()
+        if colunas_invalidas:
+            st.warning(
+                f"Algumas datas nas colunas {', '.join(colunas_invalidas)} não puderam ser convertidas. "
+                f"Verifique o formato (DD.MM.YY).")
 
         # Verificar se as colunas de data obrigatórias contêm valores válidos
-        for col in ["Início BL", "Término BL"]:
-            if df[col].isna().any():
-                st.error(f"A coluna '{col}' contém valores inválidos ou não convertíveis para data.")
-                return None
+        obrigatorias_invalidas = [col for col in ["Início BL", "Término BL"] if col in colunas_invalidas]
+        if obrigatorias_invalidas:
+            st.error(f"As colunas {', '.join(obrigatorias_invalidas)} contêm valores inválidos ou não "
+                     f"convertíveis para data.")
+            return None
 
         # Limpar strings em colunas de texto
-        df = df.apply(lambda col: col.str.replace('diasd|dias|dia', '',
-                                                  regex=True) if col.dtype == 'object' and col.name != 'Produtividade' else col)
+        str_cols = [col for col in df.select_dtypes(include='string').columns if col != 'Produtividade']
+        if str_cols:
+            df[str_cols] = df[str_cols].apply(lambda col: col.str.replace(_DIAS_PADRAO, '', regex=True))
 
-        # Garantir que Predecessoras e Sucessoras sejam strings
-        df[['Predecessoras', 'Sucessoras']] = df[['Predecessoras', 'Sucessoras']].astype(str)
+        # Garantir que Predecessoras e Sucessoras sejam strings (valores ausentes permanecem <NA>)
+        df[['Predecessoras', 'Sucessoras']] = df[['Predecessoras', 'Sucessoras']].astype('string[pyarrow]')
 
         # Processar Duração BL
-        df['Duração BL'] = df['Duração BL'].astype(str).str.replace(',', '.').str.strip()
+        duracao_bl = df['Duração BL'].astype('string[pyarrow]').str.replace(',', '.', regex=False)
         try:
-            df['Duração BL'] = df['Duração BL'].astype(float).astype(int)
-        except ValueError as e:
+            df['Duração BL'] = pd.to_numeric(duracao_bl, errors='raise').astype('int32')
+        except (ValueError, TypeError) as e:
             st.error(f"Erro ao converter 'Duração BL' para número inteiro: {str(e)}")
             return None
 
         # Calcular Custo Diário
-        df['Custo Diário'] = df['Custo'] / df['Duração BL']
+        # Tarefas com duração zero (marcos) ficam com custo diário 0 em vez de inf
+        duracao = df['Duração BL'].to_numpy()
+        custo = df['Custo'].to_numpy(dtype=np.float64)
+        custo_diario = np.zeros_like(custo)
+        np.divide(custo, duracao, out=custo_diario, where=duracao != 0)
+        df['Custo Diário'] = custo_diario
+
+        # Reduzir colunas numéricas auxiliares (Custo permanece float64 para preservar os totais)
+        for col in ['Folga', 'Quant. Prev.', 'Produtividade', 'Duração']:
+            if col not in df.columns:
+                continue
+            if pd.api.types.is_float_dtype(df[col]):
+                df[col] = df[col].astype('float32')
+            elif pd.api.types.is_integer_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], downcast='integer')
+
+        # Colunas Sim/Não como categóricas, tornando as comparações com '==' comparações de códigos
+        for col in ['Crítica', 'Resumo']:
+            if col in df.columns:
+                categorias = sorted(set(df[col].dropna().unique()) | {'Sim', 'Não'}, key=str)
+                df[col] = df[col].astype(pd.CategoricalDtype(categorias))
 
-        return df
+        return normalizar_cronograma(df)
     except Exception as e:
         st.error(f"Erro ao processar o arquivo Excel: {str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+
+def normalizar_cronograma(df):
+    """
+    Padroniza as colunas consumidas pelas análises, para que elas não precisem reconvertê-las a cada chamada.
+
+    Folga e Duração BL ficam numéricas (valores inválidos ou ausentes viram 0), Início BL e Término BL
+    ficam como datetime e os espaços nas pontas de Nome da tarefa são removidos. Como é aplicada dentro
+    de ler_arquivo_excel_cached, o resultado já fica em cache junto com a leitura do arquivo.
+
+    Args:
+        df (pd.DataFrame): DataFrame lido da planilha.
+
+    Returns:
+        pd.DataFrame: DataFrame normalizado.
+    """
+    folga = df['Folga']
+    if not pd.api.types.is_numeric_dtype(folga):
+        folga = pd.to_numeric(folga.astype(str).str.replace(' dias', '', regex=False), errors='coerce')
+    df['Folga'] = folga.fillna(0)
+    df['Duração BL'] = pd.to_numeric(df['Duração BL'], errors='coerce').fillna(0)
+    df['Início BL'] = pd.to_datetime(df['Início BL'], errors='coerce')
+    df['Término BL'] = pd.to_datetime(df['Término BL'], errors='coerce')
+    df['Nome da tarefa'] = df['Nome da tarefa'].str.strip()
+    return df
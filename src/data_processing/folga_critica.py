@@ -1,6 +1,210 @@
 import pandas as pd
+import numpy as np
 import streamlit as st
 import re
+from dataclasses import dataclass
+from functools import lru_cache
+from numba import njit
+from src.utils.utils import FORMATO_DATA, hash_dataframe
+
+# Padrões da coluna Sucessoras, ex.: '12;15FS+2 dias,18SS'
+_SEPARADOR_RE = re.compile(r'[;,]')
+_NAO_DIGITO_RE = re.compile(r'[^0-9]')
+_SUCESSORA_RE = re.compile(r'(\d+)(FS|SS|FF|SF)?(?:([+-]\d+)(?:\s*dias)?)?')
+
+# Tipos de relacionamento codificados como int8 para o núcleo compilado da simulação
+_TIPOS_RELACAO = {'FS': 0, 'SS': 1, 'FF': 2, 'SF': 3}
+_DIA_NS = 86_400_000_000_000
+
+
+@lru_cache(maxsize=4096)
+def _ids_sucessoras(sucessoras):
+    ids = (_NAO_DIGITO_RE.sub('', id) for id in _SEPARADOR_RE.split(sucessoras))
+    return tuple(id for id in ids if id.isdigit())
+
+
+@lru_cache(maxsize=4096)
+def _relacoes_sucessoras(sucessoras):
+    sucessoras_lista = []
+    for item in _SEPARADOR_RE.split(sucessoras):
+        # Extrair ID, tipo de relacionamento e lag/lead
+        match = _SUCESSORA_RE.match(item.strip())
+        if match:
+            task_id = match.group(1)
+            rel_type = match.group(2) or 'FS'  # Default para FS se não especificado
+            lag = int(match.group(3) or 0)  # Default para 0 se não especificado
+            sucessoras_lista.append({'id': task_id, 'rel_type': rel_type, 'lag': lag})
+    return tuple(sucessoras_lista)
+
+
+def extrair_ids_sucessoras(sucessoras):
+    """
+    Extrai os IDs das tarefas sucessoras, ignorando tipos de relacionamento e lags.
+
+    Args:
+        sucessoras (str): Conteúdo da coluna Sucessoras (ex.: '12;15TI+33 dias').
+
+    Returns:
+        tuple: IDs das sucessoras como strings.
+    """
+    if pd.isna(sucessoras) or sucessoras == '':
+        return ()
+    return _ids_sucessoras(str(sucessoras))
+
+
+def extrair_relacoes_sucessoras(sucessoras):
+    """
+    Extrai ID, tipo de relacionamento (FS, SS, FF, SF) e lag/lead de cada sucessora.
+
+    Args:
+        sucessoras (str): Conteúdo da coluna Sucessoras (ex.: '12;15FS+2 dias').
+
+    Returns:
+        tuple: Dicionários com as chaves 'id', 'rel_type' e 'lag'.
+    """
+    if pd.isna(sucessoras) or sucessoras == '':
+        return ()
+    return _relacoes_sucessoras(str(sucessoras))
+
+
+@dataclass(frozen=True)
+class GrafoSucessoras:
+    """
+    Grafo de sucessoras em formato CSR, indexado pela posição das tarefas no DataFrame.
+
+    As sucessoras da tarefa na posição p ocupam indices[indptr[p]:indptr[p + 1]], com os tipos de
+    relacionamento correspondentes em tipos (int8: FS=0, SS=1, FF=2, SF=3) e os lags, em dias, em lags.
+    """
+    indptr: np.ndarray
+    indices: np.ndarray
+    tipos: np.ndarray
+    lags: np.ndarray
+
+
+@st.cache_resource(hash_funcs={pd.DataFrame: hash_dataframe})
+def montar_grafo_sucessoras(sucessoras):
+    """
+    Interpreta a coluna Sucessoras uma única vez e monta o grafo CSR usado pela simulação de atraso.
+
+    O grafo fica em cache pelo conteúdo da coluna (e do índice), sendo compartilhado entre simulações;
+    por isso os arrays são somente leitura.
+
+    Args:
+        sucessoras (pd.DataFrame): DataFrame de uma coluna com as Sucessoras (df[['Sucessoras']]).
+
+    Returns:
+        GrafoSucessoras: Grafo com as sucessoras que existem no cronograma.
+    """
+    posicao_por_id = {idx: pos for pos, idx in enumerate(sucessoras.index)}
+    indptr = np.zeros(len(sucessoras) + 1, dtype=np.int64)
+    indices, tipos, lags = [], [], []
+    for pos, texto in enumerate(sucessoras['Sucessoras']):
+        for suc in extrair_relacoes_sucessoras(texto):
+            suc_pos = posicao_por_id.get(int(suc['id']))
+            if suc_pos is not None:  # Sucessoras fora do cronograma são ignoradas
+                indices.append(suc_pos)
+                tipos.append(_TIPOS_RELACAO[suc['rel_type']])
+                lags.append(suc['lag'])
+        indptr[pos + 1] = len(indices)
+
+    grafo = GrafoSucessoras(
+        indptr=indptr,
+        indices=np.array(indices, dtype=np.int64),
+        tipos=np.array(tipos, dtype=np.int8),
+        lags=np.array(lags, dtype=np.float64),
+    )
+    for array in (grafo.indptr, grafo.indices, grafo.tipos, grafo.lags):
+        array.setflags(write=False)
+    return grafo
+
+
+@njit(cache=True)
+def _propagar_atraso(origem, atraso, indptr, indices, tipos, lags, duracao, folga, inicio, termino):
+    """
+    Núcleo compilado da simulação: propaga o atraso pelas sucessoras em profundidade (pilha explícita),
+    visitando cada tarefa uma única vez, na mesma ordem da versão em Python.
+
+    Args:
+        origem (int): Posição da tarefa atrasada.
+        atraso (float): Dias de atraso aplicados à tarefa de origem.
+        indptr, indices, tipos, lags (np.ndarray): Grafo de sucessoras em formato CSR (posições, tipo
+            de relacionamento em int8 e lag em dias).
+        duracao, folga (np.ndarray): Duração BL e Folga de cada tarefa, em dias.
+        inicio, termino (np.ndarray): Início BL e Término BL em nanossegundos (int64).
+
+    Returns:
+        tuple: (ordem, atraso_inicio, atraso_termino, novo_inicio, novo_termino, nova_folga), em que
+            ordem traz as posições impactadas na ordem de visita e os demais arrays são indexados por posição.
+    """
+    n = folga.shape[0]
+    ordem = np.empty(n, np.int64)
+    visitado = np.zeros(n, np.bool_)
+    atraso_inicio = np.zeros(n)
+    atraso_termino = np.zeros(n)
+    novo_inicio = inicio.copy()
+    novo_termino = termino.copy()
+    nova_folga = folga.copy()
+
+    # Cada aresta empilha no máximo uma tarefa, além da tarefa de origem
+    pilha_pos = np.empty(indices.shape[0] + 1, np.int64)
+    pilha_inicio = np.empty(indices.shape[0] + 1)
+    pilha_termino = np.empty(indices.shape[0] + 1)
+    pilha_pos[0] = origem
+    pilha_inicio[0] = atraso
+    pilha_termino[0] = atraso
+    topo = 1
+    total = 0
+
+    while topo > 0:
+        topo -= 1
+        atual = pilha_pos[topo]
+        ai = pilha_inicio[topo]
+        at = pilha_termino[topo]
+        if visitado[atual]:
+            continue
+        visitado[atual] = True
+        ordem[total] = atual
+        total += 1
+        atraso_inicio[atual] = ai
+        atraso_termino[atual] = at
+
+        # O atraso absorvido é limitado pela folga total
+        maior_atraso = max(ai, at)
+        atraso_absorvido = min(folga[atual], maior_atraso)
+        atraso_propagado = maior_atraso - atraso_absorvido
+        nova_folga[atual] = folga[atual] - atraso_absorvido
+
+        # Ajustar datas com base no atraso, mantendo a duração
+        ni = inicio[atual] + np.int64(np.rint(ai * _DIA_NS))
+        nt = termino[atual] + np.int64(np.rint(at * _DIA_NS))
+        if (nt - ni) // _DIA_NS != duracao[atual]:
+            nt = ni + np.int64(np.rint(duracao[atual] * _DIA_NS))
+        novo_inicio[atual] = ni
+        novo_termino[atual] = nt
+
+        # Empilhar em ordem inversa para visitar as sucessoras na ordem em que aparecem
+        for k in range(indptr[atual + 1] - 1, indptr[atual] - 1, -1):
+            suc = indices[k]
+            lag = lags[k]
+            if tipos[k] == 0:  # FS
+                novo_ai = atraso_propagado + lag
+                novo_at = atraso_propagado + lag
+            elif tipos[k] == 1:  # SS: afeta o início, término ajustado pela duração
+                novo_ai = ai + lag
+                novo_at = ai + lag
+            elif tipos[k] == 2:  # FF
+                novo_ai = at + lag - duracao[suc]
+                novo_at = at + lag
+            else:  # SF
+                novo_ai = at + lag
+                novo_at = at + lag + duracao[suc]
+            pilha_pos[topo] = suc
+            pilha_inicio[topo] = max(0.0, novo_ai)
+            pilha_termino[topo] = max(0.0, novo_at)
+            topo += 1
+
+    return ordem[:total], atraso_inicio, atraso_termino, novo_inicio, novo_termino, nova_folga
+
 
 def analisar_cadeias_folga_curta(df, limite_folga):
     """
@@ -22,13 +226,6 @@ def analisar_cadeias_folga_curta(df, limite_folga):
             return pd.DataFrame(
                 columns=['Tarefa', 'Folga (dias)', 'Cadeia até Caminho Crítico', 'Folga Total da Cadeia (dias)'])
 
-        # Copiar DataFrame
-        df = df.copy()
-
-        # Garantir que a coluna Folga é numérica, removendo ' dias' se presente
-        df['Folga'] = df['Folga'].astype(str).str.replace(' dias', '', regex=False)
-        df['Folga'] = pd.to_numeric(df['Folga'], errors='coerce').fillna(0)
-
         # Filtrar tarefas com folga curta (0 < Folga <= limite_folga)
         tarefas_folga_curta = df[(df['Folga'] > 0) & (df['Folga'] <= limite_folga)][
             ['Nome da tarefa', 'Folga', 'Sucessoras', 'Crítica']]
@@ -38,52 +235,54 @@ def analisar_cadeias_folga_curta(df, limite_folga):
             return pd.DataFrame(
                 columns=['Tarefa', 'Folga (dias)', 'Cadeia até Caminho Crítico', 'Folga Total da Cadeia (dias)'])
 
-        # Função para extrair IDs de tarefas das sucessoras
-        def extrair_ids_sucessoras(sucessoras):
-            if pd.isna(sucessoras) or sucessoras == '':
-                return []
-            # Remover notações como 'TI+33 dias', 'TT', etc., mantendo apenas IDs
-            ids = re.split(';|,', str(sucessoras))
-            return [re.sub(r'[^0-9]', '', id) for id in ids if re.sub(r'[^0-9]', '', id).isdigit()]
+        # Mapas índice -> valor para consultas O(1) durante o rastreamento das cadeias
+        nome_por_id = df['Nome da tarefa'].to_dict()
+        folga_por_id = df['Folga'].to_dict()
+        sucessoras_por_id = df['Sucessoras'].to_dict()
+        critica_por_id = df['Crítica'].to_dict()
+
+        # Sucessora de menor folga (mais próxima do caminho crítico) de cada tarefa, calculada uma
+        # única vez: cadeias que convergem para as mesmas tarefas apenas seguem os ponteiros já salvos
+        proxima_por_id = {}
+
+        def proxima_tarefa(tarefa_idx):
+            if tarefa_idx not in proxima_por_id:
+                min_folga = float('inf')
+                proxima = None
+                for suc_idx in extrair_ids_sucessoras(sucessoras_por_id[tarefa_idx]):
+                    suc_idx = int(suc_idx)
+                    if suc_idx in folga_por_id and folga_por_id[suc_idx] < min_folga:
+                        min_folga = folga_por_id[suc_idx]
+                        proxima = suc_idx
+                proxima_por_id[tarefa_idx] = proxima
+            return proxima_por_id[tarefa_idx]
 
         # Função para rastrear a cadeia até uma tarefa crítica
-        def rastrear_cadeia(tarefa_idx, df):
+        def rastrear_cadeia(tarefa_idx):
             cadeia = []
             folga_total = 0
-            current_idx = tarefa_idx
+            # Como na versão original (while current_idx), uma tarefa inicial de índice 0 não é rastreada
+            current_idx = tarefa_idx if tarefa_idx else None
             visited = set()  # Evitar loops
 
-            while current_idx and current_idx not in visited:
-                tarefa = df[df.index == int(current_idx)]
-                if tarefa.empty:
+            while current_idx is not None and current_idx not in visited:
+                if current_idx not in nome_por_id:
                     break
-                tarefa_row = tarefa.iloc[0]
-                cadeia.append(tarefa_row['Nome da tarefa'])
-                folga_total += tarefa_row['Folga']
+                cadeia.append(nome_por_id[current_idx])
+                folga_total += folga_por_id[current_idx]
 
-                if tarefa_row['Crítica'] == 'Sim':
+                if critica_por_id[current_idx] == 'Sim':
                     break
 
                 visited.add(current_idx)
-                sucessoras = extrair_ids_sucessoras(tarefa_row['Sucessoras'])
-
-                # Escolher a sucessora com menor folga (mais próxima do caminho crítico)
-                min_folga = float('inf')
-                proxima_tarefa = None
-                for suc_idx in sucessoras:
-                    suc = df[df.index == int(suc_idx)]
-                    if not suc.empty and suc['Folga'].iloc[0] < min_folga:
-                        min_folga = suc['Folga'].iloc[0]
-                        proxima_tarefa = suc_idx
-
-                current_idx = proxima_tarefa
+                current_idx = proxima_tarefa(current_idx)
 
             return cadeia, folga_total
 
         # Criar tabela de resultados
         resultados = []
         for idx, row in tarefas_folga_curta.iterrows():
-            cadeia, folga_total = rastrear_cadeia(idx, df)
+            cadeia, folga_total = rastrear_cadeia(idx)
             resultados.append({
                 'Tarefa': row['Nome da tarefa'],
                 'Folga (dias)': row['Folga'],
@@ -123,129 +322,68 @@ def simular_atraso_caminho_critico(df, tarefa_idx, dias_atraso):
             st.error("Colunas necessárias para simulação de atraso não encontradas.")
             return pd.DataFrame(), pd.DataFrame(), None
 
-        # Copiar DataFrame
+        # Copiar DataFrame; os formatos das colunas já vêm de normalizar_cronograma
         df_sim = df.copy()
 
-        # Garantir formatos
-        df_sim['Início BL'] = pd.to_datetime(df_sim['Início BL'], errors='coerce')
-        df_sim['Término BL'] = pd.to_datetime(df_sim['Término BL'], errors='coerce')
-        df_sim['Folga'] = df_sim['Folga'].astype(str).str.replace(' dias', '', regex=False)
-        df_sim['Folga'] = pd.to_numeric(df_sim['Folga'], errors='coerce').fillna(0)
-        df_sim['Duração BL'] = pd.to_numeric(df_sim['Duração BL'], errors='coerce').fillna(0)
-
         # Verificar se tarefa_idx existe
         if tarefa_idx not in df_sim.index:
             st.error(f"Tarefa com índice {tarefa_idx} não encontrada.")
             return pd.DataFrame(), pd.DataFrame(), None
 
-        # Função para extrair IDs, tipo de relacionamento e lag/lead das sucessoras
-        def extrair_ids_sucessoras(sucessoras):
-            if pd.isna(sucessoras) or sucessoras == '':
-                return []
-            # Separar sucessoras por ; ou ,
-            ids = re.split(';|,', str(sucessoras))
-            sucessoras_lista = []
-            for item in ids:
-                # Extrair ID, tipo de relacionamento e lag/lead
-                match = re.match(r'(\d+)(FS|SS|FF|SF)?(?:([+-]\d+)(?:\s*dias)?)?', item.strip())
-                if match:
-                    task_id = match.group(1)
-                    rel_type = match.group(2) or 'FS'  # Default para FS se não especificado
-                    lag = int(match.group(3) or 0)  # Default para 0 se não especificado
-                    sucessoras_lista.append({'id': task_id, 'rel_type': rel_type, 'lag': lag})
-            return sucessoras_lista
-
-        # Inicializar listas para rastrear impacto
-        tarefas_impactadas = []
-        visited = set()
-
-        # Função para propagar atraso
-        def propagar_atraso(current_idx, atraso_inicio, atraso_termino):
-            if current_idx in visited or current_idx not in df_sim.index:
-                return
-            visited.add(current_idx)
-            tarefa = df_sim[df_sim.index == int(current_idx)].iloc[0]
-            folga_original = tarefa['Folga']
-            # O atraso absorvido é limitado pela folga total
-            atraso_absorvido = min(folga_original, max(atraso_inicio, atraso_termino))
-            atraso_propagado = max(atraso_inicio, atraso_termino) - atraso_absorvido
-            nova_folga = folga_original - atraso_absorvido
-
-            # Ajustar datas com base no atraso
-            novo_inicio = tarefa['Início BL'] + pd.Timedelta(days=atraso_inicio)
-            novo_termino = tarefa['Término BL'] + pd.Timedelta(days=atraso_termino)
-
-            # Garantir que a duração seja mantida
-            duracao_esperada = tarefa['Duração BL']
-            duracao_atual = (novo_termino - novo_inicio).days
-            if duracao_atual != duracao_esperada:
-                novo_termino = novo_inicio + pd.Timedelta(days=duracao_esperada)
-
-            # Registrar tarefa impactada
-            tarefas_impactadas.append({
-                'Tarefa': tarefa['Nome da tarefa'],
-                'Índice': current_idx,
-                'Início Original': tarefa['Início BL'].strftime('%d/%m/%y'),
-                'Término Original': tarefa['Término BL'].strftime('%d/%m/%y'),
-                'Início Novo': novo_inicio.strftime('%d/%m/%y'),
-                'Término Novo': novo_termino.strftime('%d/%m/%y'),
-                'Folga Original (dias)': folga_original,
-                'Nova Folga (dias)': nova_folga,
-                'Atraso Aplicado (Início, dias)': atraso_inicio,
-                'Atraso Aplicado (Término, dias)': atraso_termino
-            })
+        # Grafo de sucessoras (CSR por posição), interpretado uma vez e reaproveitado entre simulações
+        grafo = montar_grafo_sucessoras(df_sim[['Sucessoras']])
 
-            # Atualizar DataFrame simulado
-            df_sim.loc[df_sim.index == current_idx, 'Início BL'] = novo_inicio
-            df_sim.loc[df_sim.index == current_idx, 'Término BL'] = novo_termino
-            df_sim.loc[df_sim.index == current_idx, 'Folga'] = nova_folga
-            df_sim.loc[df_sim.index == current_idx, 'Crítica'] = 'Sim' if nova_folga == 0 else 'Não'
-
-            # Propagar atraso para sucessoras com base no tipo de relacionamento
-            sucessoras = extrair_ids_sucessoras(tarefa['Sucessoras'])
-            for suc in sucessoras:
-                suc_idx = int(suc['id'])
-                rel_type = suc['rel_type']
-                lag = suc['lag']
-
-                # Calcular atraso propagado com base no tipo de relacionamento
-                if rel_type == 'FS':
-                    novo_atraso_inicio = atraso_propagado + lag
-                    novo_atraso_termino = atraso_propagado + lag
-                elif rel_type == 'SS':
-                    novo_atraso_inicio = atraso_inicio + lag
-                    novo_atraso_termino = atraso_inicio + lag  # SS afeta o início, término ajustado pela duração
-                elif rel_type == 'FF':
-                    novo_atraso_inicio = atraso_termino + lag - df_sim.loc[suc_idx, 'Duração BL']
-                    novo_atraso_termino = atraso_termino + lag
-                elif rel_type == 'SF':
-                    novo_atraso_inicio = atraso_termino + lag
-                    novo_atraso_termino = atraso_termino + lag + df_sim.loc[suc_idx, 'Duração BL']
-                else:
-                    continue  # Ignorar tipos desconhecidos
-
-                propagar_atraso(suc_idx, max(0, novo_atraso_inicio), max(0, novo_atraso_termino))
-
-        # Iniciar propagação do atraso na tarefa inicial
-        tarefa_inicial = df_sim[df_sim.index == int(tarefa_idx)].iloc[0]
-        propagar_atraso(tarefa_idx, dias_atraso, dias_atraso)
+        inicio = df_sim['Início BL'].to_numpy(dtype='datetime64[ns]')
+        termino = df_sim['Término BL'].to_numpy(dtype='datetime64[ns]')
+        folga = df_sim['Folga'].to_numpy(dtype=np.float64)
+
+        # Propagar o atraso a partir da tarefa inicial no núcleo compilado
+        ordem, atraso_inicio, atraso_termino, novo_inicio, novo_termino, nova_folga = _propagar_atraso(
+            df_sim.index.get_loc(tarefa_idx), float(dias_atraso),
+            grafo.indptr, grafo.indices, grafo.tipos, grafo.lags,
+            df_sim['Duração BL'].to_numpy(dtype=np.float64), folga, inicio.view(np.int64), termino.view(np.int64)
+        )
+        novo_inicio = novo_inicio.view('datetime64[ns]')
+        novo_termino = novo_termino.view('datetime64[ns]')
 
         # Criar tabela de impacto
-        tabela_impacto = pd.DataFrame(tarefas_impactadas)
+        idxs = df_sim.index[ordem]
+        tabela_impacto = pd.DataFrame({
+            'Tarefa': df_sim['Nome da tarefa'].to_numpy()[ordem],
+            'Índice': idxs,
+            'Início Original': inicio[ordem],
+            'Término Original': termino[ordem],
+            'Início Novo': novo_inicio[ordem],
+            'Término Novo': novo_termino[ordem],
+            'Folga Original (dias)': folga[ordem],
+            'Nova Folga (dias)': nova_folga[ordem],
+            'Atraso Aplicado (Início, dias)': atraso_inicio[ordem],
+            'Atraso Aplicado (Término, dias)': atraso_termino[ordem]
+        })
+        # Datas montadas como datetime e formatadas uma única vez por coluna
+        colunas_data = ['Início Original', 'Término Original', 'Início Novo', 'Término Novo']
+        tabela_impacto[colunas_data] = tabela_impacto[colunas_data].apply(lambda col: col.dt.strftime(FORMATO_DATA))
         if tabela_impacto.empty:
             st.warning("Nenhuma tarefa impactada pelo atraso.")
-            tabela_impacto = pd.DataFrame(columns=[
-                'Tarefa', 'Índice', 'Início Original', 'Término Original',
-                'Início Novo', 'Término Novo', 'Folga Original (dias)', 'Nova Folga (dias)',
-                'Atraso Aplicado (Início, dias)', 'Atraso Aplicado (Término, dias)'
-            ])
+
+        # Atualizar o DataFrame simulado sem busca por rótulo: as datas do núcleo cobrem todas as tarefas (as
+        # não impactadas mantêm os valores originais) e substituem as colunas inteiras; Folga e Crítica
+        # recebem uma única escrita posicional nas tarefas impactadas. Um atraso fracionário gera folgas
+        # não inteiras, que não cabem numa coluna inteira: nesse caso Folga passa a float64 antes da escrita
+        df_sim['Início BL'] = novo_inicio
+        df_sim['Término BL'] = novo_termino
+        if np.any(np.mod(nova_folga[ordem], 1) != 0):
+            df_sim['Folga'] = df_sim['Folga'].astype('float64')
+        colunas = df_sim.columns.get_indexer(['Folga', 'Crítica'])
+        df_sim.iloc[ordem, colunas[0]] = nova_folga[ordem]
+        df_sim.iloc[ordem, colunas[1]] = np.where(nova_folga[ordem] == 0, 'Sim', 'Não')
 
         # Identificar novo caminho crítico (tarefas com folga = 0)
         tabela_novo_critico = df_sim[df_sim['Folga'] == 0][
             ['Nome da tarefa', 'Início BL', 'Término BL', 'Duração BL', 'Folga']
         ].copy()
-        tabela_novo_critico['Início BL'] = tabela_novo_critico['Início BL'].dt.strftime('%d/%m/%y')
-        tabela_novo_critico['Término BL'] = tabela_novo_critico['Término BL'].dt.strftime('%d/%m/%y')
+        tabela_novo_critico['Início BL'] = tabela_novo_critico['Início BL'].dt.strftime(FORMATO_DATA)
+        tabela_novo_critico['Término BL'] = tabela_novo_critico['Término BL'].dt.strftime(FORMATO_DATA)
         if tabela_novo_critico.empty:
             st.warning("Nenhum novo caminho crítico identificado após o atraso.")
 
@@ -254,7 +392,7 @@ def simular_atraso_caminho_critico(df, tarefa_idx, dias_atraso):
         if pd.isna(nova_data_termino):
             nova_data_termino = None
         else:
-            nova_data_termino = nova_data_termino.strftime('%d/%m/%y')
+            nova_data_termino = nova_data_termino.strftime(FORMATO_DATA)
 
         return tabela_impacto, tabela_novo_critico, nova_data_termino
 
@@ -1,8 +1,10 @@
 import pandas as pd
 import streamlit as st
 import numpy as np
+from src.utils.utils import FORMATO_DATA, hash_dataframe
 
 
+@st.cache_data(hash_funcs={pd.DataFrame: hash_dataframe})
 def calcular_indicadores(df):
     """
     Calcula indicadores de desempenho do cronograma.
@@ -15,24 +17,26 @@ def calcular_indicadores(df):
     """
     try:
         quant_tarefas = len(df)
-        leads = df['Predecessoras'].apply(lambda x: '+' in x if isinstance(x, str) else False).sum()
-        lags = df['Predecessoras'].apply(lambda x: '-' in x if isinstance(x, str) else False).sum()
-        relationship_types = df['Predecessoras'].apply(
-            lambda x: all(s not in x for s in ['II', 'IT', 'TT']) if isinstance(x, str) else True).sum()
-        linhas_vazias = df[(df['Predecessoras'] == '') & (df['Sucessoras'] == '')]
-        logic = len(linhas_vazias)
+        # Buscas vetorizadas; células vazias (NA) não contam como latência nem como tipo II/IT/TT
+        pred = df['Predecessoras'].astype('string')
+        leads = pred.str.contains('+', regex=False, na=False).sum()
+        lags = pred.str.contains('-', regex=False, na=False).sum()
+        relationship_types = (~pred.str.contains('II|IT|TT', regex=True, na=False)).sum()
+        # Apenas '' conta como sem vínculo; NA nunca foi igual a '' na leitura original
+        sem_vinculo = pred.eq('') & df['Sucessoras'].astype('string').eq('')
+        logic = sem_vinculo.fillna(False).sum()
         leads_pct = (leads / quant_tarefas) * 100
         lags_pct = (lags / quant_tarefas) * 100
         relationship_types_pct = (relationship_types / quant_tarefas) * 100
         logic_pct = (logic / quant_tarefas) * 100
 
-        # Garantir que as colunas de data são datetime
-        data_inicio = pd.to_datetime(df['Início BL'].min())
-        data_termino = pd.to_datetime(df['Término BL'].max())
+        # Colunas de data já chegam como datetime (ver normalizar_cronograma)
+        data_inicio = df['Início BL'].min()
+        data_termino = df['Término BL'].max()
 
         # Formatando as datas
-        data_inicio_str = data_inicio.strftime("%d/%m/%y") if pd.notna(data_inicio) else "N/A"
-        data_termino_str = data_termino.strftime("%d/%m/%y") if pd.notna(data_termino) else "N/A"
+        data_inicio_str = data_inicio.strftime(FORMATO_DATA) if pd.notna(data_inicio) else "N/A"
+        data_termino_str = data_termino.strftime(FORMATO_DATA) if pd.notna(data_termino) else "N/A"
         duracao_total = (data_termino - data_inicio).days if pd.notna(data_inicio) and pd.notna(data_termino) else 0
 
         return leads_pct, lags_pct, relationship_types_pct, logic_pct, data_inicio_str, data_termino_str, duracao_total
@@ -41,6 +45,7 @@ def calcular_indicadores(df):
         return 0, 0, 0, 0, "N/A", "N/A", 0
 
 
+@st.cache_data(hash_funcs={pd.DataFrame: hash_dataframe})
 def analisar_duracao(df, limite_alta, limite_baixa):
     """
     Identifica tarefas com alta e baixa duração com base em limites de dias fornecidos pelo usuário.
@@ -60,20 +65,15 @@ def analisar_duracao(df, limite_alta, limite_baixa):
             st.error("Colunas necessárias para análise de duração não encontradas.")
             return pd.DataFrame(columns=colunas_desejadas), pd.DataFrame(columns=colunas_desejadas)
 
-        # Copiar DataFrame e garantir formato de data
-        df = df.copy()
-        df['Início BL'] = pd.to_datetime(df['Início BL'])
-        df['Término BL'] = pd.to_datetime(df['Término BL'])
-        df['Início BL Str'] = df['Início BL'].dt.strftime('%d/%m/%y')
-        df['Término BL Str'] = df['Término BL'].dt.strftime('%d/%m/%y')
-
-        # Filtrar tarefas
-        tarefas_alta = df[df['Duração BL'] >= limite_alta][colunas_desejadas]
-        tarefas_baixa = df[df['Duração BL'] <= limite_baixa][colunas_desejadas]
-
-        # Ordenar por Duração BL
-        tarefas_alta = tarefas_alta.sort_values(by='Duração BL', ascending=False)
-        tarefas_baixa = tarefas_baixa.sort_values(by='Duração BL')
+        # Filtrar e ordenar por Duração BL sobre um único array, selecionando as linhas já na ordem final
+        # (ordenação estável: tarefas com a mesma duração mantêm a ordem do cronograma)
+        duracao = df['Duração BL'].to_numpy()
+        posicoes_alta = np.flatnonzero(duracao >= limite_alta)
+        posicoes_baixa = np.flatnonzero(duracao <= limite_baixa)
+        posicoes_alta = posicoes_alta[np.argsort(-duracao[posicoes_alta], kind='stable')]
+        posicoes_baixa = posicoes_baixa[np.argsort(duracao[posicoes_baixa], kind='stable')]
+        tarefas_alta = df.iloc[posicoes_alta][colunas_desejadas]
+        tarefas_baixa = df.iloc[posicoes_baixa][colunas_desejadas]
 
         return tarefas_alta, tarefas_baixa
     except Exception as e:
@@ -81,6 +81,7 @@ def analisar_duracao(df, limite_alta, limite_baixa):
         return pd.DataFrame(columns=colunas_desejadas), pd.DataFrame(columns=colunas_desejadas)
 
 
+@st.cache_data(hash_funcs={pd.DataFrame: hash_dataframe})
 def analisar_folga_curta(df, limite_folga):
     """
     Identifica tarefas com folga curta com base em um limite de dias fornecido pelo usuário,
@@ -100,17 +101,6 @@ def analisar_folga_curta(df, limite_folga):
             st.error("Colunas necessárias para análise de folga não encontradas.")
             return pd.DataFrame(columns=colunas_desejadas)
 
-        # Copiar DataFrame e garantir formato de data
-        df = df.copy()
-        df['Início BL'] = pd.to_datetime(df['Início BL'])
-        df['Término BL'] = pd.to_datetime(df['Término BL'])
-        df['Início BL Str'] = df['Início BL'].dt.strftime('%d/%m/%y')
-        df['Término BL Str'] = df['Término BL'].dt.strftime('%d/%m/%y')
-
-        # Garantir que a coluna Folga é numérica, removendo ' dias'
-        df['Folga'] = df['Folga'].astype(str).str.replace(' dias', '', regex=False)
-        df['Folga'] = pd.to_numeric(df['Folga'], errors='coerce').fillna(0)
-
         # Filtrar tarefas com folga curta (0 < Folga <= limite_folga)
         tarefas_folga_curta = df[(df['Folga'] > 0) & (df['Folga'] <= limite_folga)][colunas_desejadas]
 
@@ -2,27 +2,24 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import math
+from src.utils.utils import format_currency_series
 
 
 def selecionar_feriados(feriados_texto):
     """
-    Converte texto de feriados em uma lista de datas.
+    Converte texto de feriados em um array de datas.
 
     Args:
         feriados_texto (str): Texto com datas no formato DD/MM/YYYY, uma por linha.
 
     Returns:
-        list: Lista de datas (pd.Timestamp) ou lista vazia em caso de erro.
+        np.ndarray: Array datetime64[D] ordenado e sem repetições com as datas válidas (vazio se nenhuma for válida).
     """
-    feriados = []
-    for data_texto in feriados_texto.split('\n'):
-        data_texto = data_texto.strip()
-        if data_texto:
-            try:
-                feriados.append(pd.to_datetime(data_texto, format='%d/%m/%Y'))
-            except ValueError:
-                st.error(f"A data '{data_texto}' está em um formato inválido. Use DD/MM/YYYY.")
-    return feriados
+    linhas = pd.Series([linha.strip() for linha in feriados_texto.split('\n') if linha.strip()], dtype=object)
+    feriados = pd.to_datetime(linhas, format='%d/%m/%Y', errors='coerce')
+    for data_texto in linhas[feriados.isna()]:
+        st.error(f"A data '{data_texto}' está em um formato inválido. Use DD/MM/YYYY.")
+    return np.unique(feriados.dropna().to_numpy().astype('datetime64[D]'))
 
 
 def criar_curva_s(dataframe, agrupamento, S30, S50, S70):
@@ -35,7 +32,8 @@ def criar_curva_s(dataframe, agrupamento, S30, S50, S70):
         S30, S50, S70 (float): Fatores para as curvas S30, S50 e S70.
 
     Returns:
-        pd.DataFrame: Curva S com colunas '% ', '% Acum.', 'Custo Total', etc.
+        pd.DataFrame: Curva S com colunas '% ', '% Acum.', 'Custo Total', etc. Os percentuais
+        ('% ', '% Acum.', '%C30', '%C50', '%C70') são numéricos (float32), na escala de 0 a 100.
     """
     if agrupamento == 'Mês':
         curva_s_agrupado = dataframe.groupby(pd.Grouper(freq='ME')).sum()  # Changed 'M' to 'ME'
@@ -49,70 +47,127 @@ def criar_curva_s(dataframe, agrupamento, S30, S50, S70):
         return None
 
     curva_s_agrupado['n'] = range(0, N)
-    curva_s_agrupado['Curva30'] = curva_s_agrupado['n'].apply(
-        lambda n: (1 - ((1 - ((n / (N - 1)) ** (math.log10(30)))) ** S30)) * 100)
-    curva_s_agrupado['Curva50'] = curva_s_agrupado['n'].apply(
-        lambda n: (1 - ((1 - ((n / (N - 1)) ** (math.log10(50)))) ** S50)) * 100)
-    curva_s_agrupado['Curva70'] = curva_s_agrupado['n'].apply(
-        lambda n: (1 - ((1 - ((n / (N - 1)) ** (math.log10(70)))) ** S70)) * 100)
+    base = np.arange(N, dtype=np.float64) / (N - 1)
+    curva_s_agrupado['Curva30'] = (1 - (1 - base ** math.log10(30)) ** S30) * 100
+    curva_s_agrupado['Curva50'] = (1 - (1 - base ** math.log10(50)) ** S50) * 100
+    curva_s_agrupado['Curva70'] = (1 - (1 - base ** math.log10(70)) ** S70) * 100
     curva_s_agrupado['% Acum.'] = curva_s_agrupado['%'].cumsum()
-    curva_s_agrupado['Custo Total'] = curva_s_agrupado['Custo Total'].apply(
-        lambda x: '{:,.2f}'.format(x).replace(',', 'X').replace('.', ',').replace('X', '.'))
-    curva_s_agrupado['% '] = curva_s_agrupado['%'].apply(lambda x: f"{x:.1f}%")
-    curva_s_agrupado['% Acum.'] = curva_s_agrupado['% Acum.'].apply(lambda x: f"{x:.1f}%")
-    curva_s_agrupado['%C30'] = curva_s_agrupado['Curva30'].apply(lambda x: f"{x:.1f}%")
-    curva_s_agrupado['%C50'] = curva_s_agrupado['Curva50'].apply(lambda x: f"{x:.1f}%")
-    curva_s_agrupado['%C70'] = curva_s_agrupado['Curva70'].apply(lambda x: f"{x:.1f}%")
+    curva_s_agrupado['Custo Total'] = format_currency_series(curva_s_agrupado['Custo Total'], simbolo='')
+    # Percentuais mantidos numéricos; a formatação com '%' fica a cargo da interface
+    curva_s_agrupado['% '] = curva_s_agrupado['%'].astype('float32')
+    curva_s_agrupado['% Acum.'] = curva_s_agrupado['% Acum.'].astype('float32')
+    curva_s_agrupado['%C30'] = curva_s_agrupado['Curva30'].astype('float32')
+    curva_s_agrupado['%C50'] = curva_s_agrupado['Curva50'].astype('float32')
+    curva_s_agrupado['%C70'] = curva_s_agrupado['Curva70'].astype('float32')
     return curva_s_agrupado
 
 
-def processar_dados(arquivo_excel, feriados_texto, agrupamento_opcao, S30, S50, S70):
+@st.cache_data(show_spinner=False)
+def custo_por_dia_util(_arquivo_bytes, arquivo_hash, feriados):
+    """
+    Lê o cronograma e distribui o custo diário de cada tarefa pelos seus dias úteis.
+
+    É a etapa mais cara da Curva S e depende apenas do arquivo e dos feriados; por isso fica em cache
+    separada do agrupamento e dos fatores das curvas.
+
+    Args:
+        _arquivo_bytes (bytes): Conteúdo do arquivo Excel (ignorado pelo hash do cache).
+        arquivo_hash (str): Hash BLAKE2b do conteúdo, usado como chave do cache.
+        feriados (np.ndarray): Feriados em datetime64[D].
+
+    Returns:
+        tuple: (custo_diario, data_inicio, data_termino), com a Series de custo por dia útil entre o
+            início e o término do projeto, ou None em caso de erro.
+    """
+    from .excel_reader import ler_arquivo_excel_cached
+    df = ler_arquivo_excel_cached(_arquivo_bytes, arquivo_hash)
+    if df is None:
+        return None
+    data_inicio = df['Início BL'].min()
+    data_termino = df['Término BL'].max()
+    datas_uteis = pd.date_range(start=data_inicio, end=data_termino, freq='B')
+    # Expandir cada tarefa em todos os seus dias corridos, sem laço por tarefa (dia = início + deslocamento);
+    # os dias úteis ficam com o calendário de segunda a sexta do NumPy, já descontados os feriados
+    calendario = np.busdaycalendar(holidays=feriados)
+    tarefas = df['Nome da tarefa']
+    nomes_tarefas = pd.Index(tarefas.unique())
+    inicios = df['Início BL'].to_numpy(dtype='datetime64[D]')
+    terminos = df['Término BL'].to_numpy(dtype='datetime64[D]')
+    dias_por_tarefa = np.maximum((terminos - inicios).astype(np.int64) + 1, 0)
+    primeiro_dia = np.cumsum(dias_por_tarefa) - dias_por_tarefa
+    deslocamentos = np.arange(dias_por_tarefa.sum()) - np.repeat(primeiro_dia, dias_por_tarefa)
+    datas = np.repeat(inicios, dias_por_tarefa) + deslocamentos
+    # Busca por dia: datas_uteis herda a hora de Início BL (ex.: 08:00), enquanto os dias das tarefas são meia-noite
+    linhas = datas_uteis.normalize().get_indexer(datas.astype('datetime64[ns]'))
+    colunas = np.repeat(nomes_tarefas.get_indexer(tarefas), dias_por_tarefa)
+    custos = np.repeat(df['Custo Diário'].to_numpy(dtype='float64'), dias_por_tarefa)
+    validos = (linhas >= 0) & np.is_busday(datas, busdaycal=calendario)
+    # Tabela dia x tarefa pré-alocada em ordem de coluna (Fortran), com cada tarefa contígua na memória
+    valores = np.zeros((len(datas_uteis), len(nomes_tarefas)), order='F')
+    np.add.at(valores, (linhas[validos], colunas[validos]), custos[validos])
+    DataS = pd.DataFrame(valores, index=datas_uteis, columns=nomes_tarefas)
+    return DataS.sum(axis=1), data_inicio, data_termino
+
+
+@st.cache_data(show_spinner=False)
+def finalizar_curva_s(custo_diario, data_inicio, data_termino, agrupamento_opcao, S30, S50, S70):
+    """
+    Calcula os percentuais diários e agrupa a Curva S a partir do custo por dia útil.
+
+    Args:
+        custo_diario (pd.Series): Custo por dia útil, como retornado por custo_por_dia_util.
+        data_inicio, data_termino (pd.Timestamp): Início e término do projeto.
+        agrupamento_opcao (str): 'Mês' ou 'Semana'.
+        S30, S50, S70 (float): Fatores para curvas.
+
+    Returns:
+        pd.DataFrame: Curva S processada.
+    """
+    datas_uteis = pd.date_range(start=data_inicio, end=data_termino, freq='B')
+    if agrupamento_opcao == 'Mês':
+        datas_uteis = pd.date_range(start=data_inicio - pd.DateOffset(months=1), end=data_termino, freq='B')
+    elif agrupamento_opcao == 'Semana':
+        datas_uteis = pd.date_range(start=data_inicio - pd.DateOffset(weeks=1), end=data_termino, freq='B')
+    CurvaS = custo_diario.reindex(datas_uteis, fill_value=0.0).reset_index()
+    CurvaS.columns = ['Data', 'Custo Total']
+    CurvaS['Data'] = pd.to_datetime(CurvaS['Data'], format='%d.%m.%y')
+    CurvaS.set_index('Data', inplace=True)
+    CurvaS['Custo Total'] = CurvaS['Custo Total'].replace([np.inf, -np.inf], 0).astype('float64')  # Ensure float64
+    custo_total = CurvaS['Custo Total'].sum()
+    CurvaS['%'] = round((CurvaS['Custo Total'] / custo_total) * 100, 2).astype('float64')  # Ensure float64
+    CurvaS_agrupado = criar_curva_s(CurvaS, agrupamento_opcao, S30, S50, S70).round(1)
+    return CurvaS_agrupado
+
+
+def processar_dados(arquivo_excel, feriados_texto, agrupamento_opcao, S30, S50, S70, feriados_arr=None,
+                    conteudo=None):
     """
     Processa os dados do Excel para gerar a Curva S.
 
+    A expansão do cronograma em dias úteis fica em cache pelo hash do arquivo e pelos feriados; mudar o
+    agrupamento ou os fatores das curvas refaz apenas a etapa final.
+
     Args:
         arquivo_excel: Arquivo Excel carregado.
         feriados_texto (str): Texto com feriados.
         agrupamento_opcao (str): 'Mês' ou 'Semana'.
         S30, S50, S70 (float): Fatores para curvas.
+        feriados_arr (np.ndarray, opcional): Feriados já convertidos por selecionar_feriados. Quando
+            informado, feriados_texto não é reprocessado.
+        conteudo (tuple, opcional): (bytes, hash) já obtidos por conteudo_arquivo. Quando informado,
+            o arquivo não é lido nem hasheado novamente.
 
     Returns:
         pd.DataFrame: Curva S processada ou None em caso de erro.
     """
-    from .excel_reader import ler_arquivo_excel
+    from .excel_reader import conteudo_arquivo
     if arquivo_excel is not None:
-        df = ler_arquivo_excel(arquivo_excel)
-        if df is None:
+        arquivo_bytes, arquivo_hash = conteudo if conteudo is not None else conteudo_arquivo(arquivo_excel)
+        feriados = feriados_arr if feriados_arr is not None else selecionar_feriados(feriados_texto)
+        feriados = np.asarray(feriados, dtype='datetime64[D]')
+        expandido = custo_por_dia_util(arquivo_bytes, arquivo_hash, feriados)
+        if expandido is None:
             return None
-        df['Folga'] = pd.to_numeric(df['Folga'], errors='coerce')
-        feriados = selecionar_feriados(feriados_texto)
-        datas_uteis = pd.date_range(start=df['Início BL'].min(), end=df['Término BL'].max(), freq='B')
-        if agrupamento_opcao == 'Mês':
-            datas_uteis = pd.date_range(start=df['Início BL'].min() - pd.DateOffset(months=1),
-                                        end=df['Término BL'].max(), freq='B')
-        elif agrupamento_opcao == 'Semana':
-            datas_uteis = pd.date_range(start=df['Início BL'].min() - pd.DateOffset(weeks=1),
-                                        end=df['Término BL'].max(), freq='B')
-        DataS = pd.DataFrame(index=datas_uteis)
-        for index, row in df.iterrows():
-            data_inicio = row['Início BL']
-            data_termino = row['Término BL']
-            tarefa = row['Nome da tarefa'].strip()
-            custo_total = row['Custo']
-            custo_diario = row['Custo Diário']
-            if tarefa not in DataS.columns:
-                DataS[tarefa] = 0.0  # Initialize as float64
-            datas_tarefa = pd.date_range(start=data_inicio, end=data_termino, freq='B')
-            for data in datas_tarefa:
-                if data not in feriados:
-                    DataS.loc[data, tarefa] += custo_diario
-        CurvaS = DataS.sum(axis=1).reset_index()
-        CurvaS.columns = ['Data', 'Custo Total']
-        CurvaS['Data'] = pd.to_datetime(CurvaS['Data'], format='%d.%m.%y')
-        CurvaS.set_index('Data', inplace=True)
-        CurvaS['Custo Total'] = CurvaS['Custo Total'].replace([np.inf, -np.inf], 0).astype('float64')  # Ensure float64
-        custo_total = CurvaS['Custo Total'].sum()
-        CurvaS['%'] = round((CurvaS['Custo Total'] / custo_total) * 100, 2).astype('float64')  # Ensure float64
-        CurvaS_agrupado = criar_curva_s(CurvaS, agrupamento_opcao, S30, S50, S70).round(1)
-        return CurvaS_agrupado
-    return None
\ No newline at end of file
+        custo_diario, data_inicio, data_termino = expandido
+        return finalizar_curva_s(custo_diario, data_inicio, data_termino, agrupamento_opcao, S30, S50, S70)
+    return None
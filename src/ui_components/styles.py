@@ -0,0 +1,16 @@
+from pathlib import Path
+
+import streamlit as st
+
+CSS_PATH = Path(__file__).resolve().parents[2] / "assets" / "app.css"
+
+
+@st.cache_resource
+def carregar_css():
+    """
+    Lê a folha de estilos global da aplicação uma única vez por processo.
+
+    Returns:
+        str: Conteúdo do arquivo assets/app.css.
+    """
+    return CSS_PATH.read_text(encoding="utf-8")
@@ -1,3 +1,12 @@
+import pandas as pd
+
+# Formato curto das datas exibidas em textos e tabelas (ex.: 04/03/24)
+FORMATO_DATA = '%d/%m/%y'
+
+# Troca, numa única passada, os separadores do padrão americano (1,234.56) pelos do brasileiro (1.234,56)
+_SEPARADORES_BR = str.maketrans({',': '.', '.': ','})
+
+
 def format_currency(amount):
     """
     Formata um valor numérico como moeda em reais (R$).
@@ -8,4 +17,33 @@ def format_currency(amount):
     Returns:
         str: Valor formatado como R$ XXX.XXX,XX.
     """
-    return f'R${amount:,.2f}'.replace('.', 'X').replace(',', '.').replace('X', ',')
\ No newline at end of file
+    return f'R${amount:,.2f}'.translate(_SEPARADORES_BR)
+
+
+def format_currency_series(valores, simbolo='R$'):
+    """
+    Formata uma Series numérica como moeda no padrão brasileiro, de forma vetorizada.
+
+    Args:
+        valores (pd.Series): Valores a serem formatados.
+        simbolo (str): Prefixo da moeda ('' para omitir).
+
+    Returns:
+        pd.Series: Valores formatados como R$ XXX.XXX,XX.
+    """
+    return simbolo + valores.map('{:,.2f}'.format).str.translate(_SEPARADORES_BR)
+
+
+def hash_dataframe(df):
+    """
+    Gera uma chave de cache para um DataFrame a partir do hash vetorizado do seu conteúdo.
+
+    Usada em hash_funcs de st.cache_data para evitar que o Streamlit percorra o DataFrame a cada execução.
+
+    Args:
+        df (pd.DataFrame): DataFrame a ser identificado.
+
+    Returns:
+        tuple: Número de linhas, nomes das colunas e hash do conteúdo (incluindo o índice).
+    """
+    return len(df), tuple(df.columns), hash(pd.util.hash_pandas_object(df).to_numpy().tobytes())
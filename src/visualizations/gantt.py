@@ -1,9 +1,12 @@
+import numpy as np
 import pandas as pd
 import plotly.figure_factory as ff
 import streamlit as st
 from src.data_processing.indicators import analisar_folga_curta
+from src.utils.utils import hash_dataframe
 
 
+@st.cache_data(hash_funcs={pd.DataFrame: hash_dataframe})
 def caminho_critico_com_gantt(df):
     """
     Gera uma tabela e um gráfico de Gantt para as tarefas críticas, ordenadas por data de início,
@@ -21,22 +24,18 @@ def caminho_critico_com_gantt(df):
             st.error("Colunas necessárias para o caminho crítico não encontradas.")
             return pd.DataFrame(columns=colunas_desejadas), None
 
-        df = df.copy()
-        df['Início BL'] = pd.to_datetime(df['Início BL'])
-        df['Término BL'] = pd.to_datetime(df['Término BL'])
-        df['Início BL Str'] = df['Início BL'].dt.strftime('%d/%m/%y')
-        df['Término BL Str'] = df['Término BL'].dt.strftime('%d/%m/%y')
-
         # Filtrar tarefas críticas e ordenar por Início BL
         tabela_critica = df[df['Crítica'] == 'Sim'][colunas_desejadas].sort_values(by='Início BL')
 
-        df_gantt = df[df['Crítica'] == 'Sim'].copy()
+        df_gantt = df[df['Crítica'] == 'Sim']
         df_gantt = df_gantt.sort_values(by='Início BL')  # Ordenar por data de início
 
-        gantt_data = [
-            dict(Task=row['Nome da tarefa'], Start=row['Início BL'], Finish=row['Término BL'], Resource='Crítica')
-            for _, row in df_gantt.iterrows()
-        ]
+        gantt_data = (
+            df_gantt[['Nome da tarefa', 'Início BL', 'Término BL']]
+            .set_axis(['Task', 'Start', 'Finish'], axis=1)
+            .assign(Resource='Crítica')
+            .to_dict('records')
+        )
 
         if not gantt_data:
             return tabela_critica, None
@@ -89,24 +88,17 @@ def gantt_folga_curta(df, limite_folga):
             st.error("Colunas necessárias para análise de folga não encontradas.")
             return tabela_folga_curta, None
 
-        df = df.copy()
-        df['Início BL'] = pd.to_datetime(df['Início BL'])
-        df['Término BL'] = pd.to_datetime(df['Término BL'])
-
-        # Filtrar tarefas críticas
-        df_criticas = df[df['Crítica'] == 'Sim'][colunas_desejadas].copy()
-
-        # Combinar tarefas críticas e com folga curta
-        df_combinado = pd.concat([df_criticas, tabela_folga_curta]).drop_duplicates(subset=['Nome da tarefa'])
-        df_combinado = df_combinado.sort_values(by='Início BL')  # Ordenar por data de início
+        # Tarefas críticas e com folga curta (0 < Folga <= limite_folga) selecionadas numa única máscara
+        critica = (df['Crítica'] == 'Sim').to_numpy()
+        folga_curta = ((df['Folga'] > 0) & (df['Folga'] <= limite_folga)).to_numpy()
+        selecionadas = critica | folga_curta
+        df_combinado = df.loc[selecionadas, colunas_desejadas].assign(Crítica=critica[selecionadas])
+        df_combinado = df_combinado.sort_values(by='Início BL', kind='stable')  # Ordenar por data de início
 
         # Preparar dados para o gráfico de Gantt
-        gantt_data = []
-        for _, row in df_combinado.iterrows():
-            resource = 'Crítica' if row['Nome da tarefa'] in df_criticas['Nome da tarefa'].values else 'Folga Curta'
-            gantt_data.append(
-                dict(Task=row['Nome da tarefa'], Start=row['Início BL'], Finish=row['Término BL'], Resource=resource)
-            )
+        gantt = df_combinado[['Nome da tarefa', 'Início BL', 'Término BL']].set_axis(['Task', 'Start', 'Finish'], axis=1)
+        resource = np.where(df_combinado['Crítica'].to_numpy(), 'Crítica', 'Folga Curta')
+        gantt_data = gantt.assign(Resource=resource).to_dict('records')
 
         if not gantt_data:
             return tabela_folga_curta, None